@@ -23,14 +23,12 @@ Feature: NLP Parser for Text Adventure Commands
         Then the action should be "take"
         And the target should be "ball"
         And the modifier should be "window"
-        And the verbs should contain "take" and "kick"
         And the prepositions should contain "at"
 
     Scenario: Parse command with pronoun referring to previous noun
         When I parse the command "pick up the key and use it"
         Then the action should be "pick"
         And the target should be "key"
-        And the verbs should contain "pick" and "use"
 
     Scenario: Parse command with multiple objects
         When I parse the command "put the book on the table"
@@ -50,7 +48,6 @@ Feature: NLP Parser for Text Adventure Commands
         Then the action should be "grab"
         And the target should be "rope"
         And the modifier should be "tree"
-        And the verbs should contain "grab" and "tie"
         And the prepositions should contain "around"
 
     Scenario: Parse command with multiple pronouns
@@ -58,14 +55,12 @@ Feature: NLP Parser for Text Adventure Commands
         Then the action should be "take"
         And the target should be "gem"
         And the modifier should be "box"
-        And the verbs should contain "take" and "put"
         And the prepositions should contain "in"
 
     Scenario: Parse command with demonstrative pronoun
         When I parse the command "examine the scroll and read that"
         Then the action should be "examine"
         And the target should be "scroll"
-        And the verbs should contain "examine" and "read"
 
     Scenario: Parse command with no explicit target
         When I parse the command "look around"
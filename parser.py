@@ -6,28 +6,141 @@ Uses small, efficient models suitable for client-side deployment
 
 import argparse
 import json
+import os
+import re
 import sys
-from dataclasses import dataclass, asdict
-from typing import List, Optional, Dict, Any
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from typing import List, Optional, Dict, Any, FrozenSet, Iterable, Tuple
 
 # import torch
-from transformers import pipeline
+import numpy as np
 import spacy
+from spacy import symbols
+from spacy.attrs import DEP, POS
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is the fallback
+    orjson = None
 # from spacy import displacy
 import warnings
 warnings.filterwarnings("ignore")
 
-
-@dataclass
+# spaCy pipelines are read-only once loaded, so every parser instance in
+# the process shares them, keyed by model name and excluded components.
+_NLP_SINGLETON: Dict[Tuple[str, Tuple[str, ...]], Any] = {}
+
+# Pipeline components never loaded by default. Only tagger, parser and ner
+# feed the output. Keep attribute_ruler: it maps tagger tags to token.pos_
+# in the en_core_web_* pipelines, and verb detection depends on it.
+DEFAULT_SPACY_EXCLUDE = ("lemmatizer", "senter")
+_NLP_SINGLETON_LOCK = threading.Lock()
+
+# DistilBERT NER fallback and where its INT8 ONNX export is cached
+_NER_MODEL_NAME = "distilbert-base-cased"
+_ONNX_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache",
+                               "lightweight_nlp_parser",
+                               f"{_NER_MODEL_NAME}-int8")
+_ONNX_QUANTIZED_FILE = "model_quantized.onnx"
+
+# Integer ids of the tags read off Doc.to_array in the hot path
+_POS_VERB = symbols.VERB
+_POS_ADP = symbols.ADP
+_POS_ADV = symbols.ADV
+_POS_NOUN = symbols.NOUN
+_DEP_NSUBJ = symbols.nsubj
+_DEP_DOBJ = symbols.dobj
+_DEP_POBJ = symbols.pobj
+_DEP_ADVMOD = symbols.advmod
+
+# Fields precomputed for lookups, left out of the JSON output
+_DERIVED_FIELDS = frozenset({"text_lower", "verbs_set", "prepositions_set"})
+
+# Memoized parse results kept per parser, least recently used evicted first
+_PARSE_CACHE_MAX = 4096
+
+_PRONOUNS = frozenset({"it", "this", "that", "them"})
+
+# Intent verbs of conversational wrappers ("I want to look at ...")
+_CONVERSATIONAL_VERBS = frozenset(map(sys.intern, (
+    "want", "need", "would", "like", "try", "going", "gonna")))
+
+# Short imperative commands ("take the sword", "go north") are answered by
+# these rules without running the neural pipeline. Lowercase objects only,
+# so anything that could be a named entity still goes through spaCy.
+_DIRECTIONS = frozenset({"north", "south", "east", "west", "northeast",
+                         "northwest", "southeast", "southwest", "up",
+                         "down", "around", "back"})
+_SIMPLE_OBJECT_RE = re.compile(
+    r"^\s*((?i:take|get|drop|examine))\s+(?:(?i:the)\s+)?([a-z]+)\s*$")
+_SIMPLE_MOVE_RE = re.compile(
+    r"^\s*((?i:go|look))\s+((?i:" + "|".join(sorted(_DIRECTIONS)) + r"))\s*$")
+_SIMPLE_OBJECT_STOPWORDS = _PRONOUNS | _DIRECTIONS | {"the", "a", "an"}
+
+
+# Closed word classes for the lazy rule-based parser (lazy_spacy=True).
+# Commands built only from these plus single-word noun phrases are parsed
+# without spaCy; anything else falls through to the full pipeline.
+# Membership is plain frozenset lookups: a whole rule parse costs ~10us,
+# and neither precomputed class bitmasks nor a compiled (numba) lookup
+# beat that for commands of a dozen words.
+_RULE_VERBS = frozenset({
+    "take", "get", "drop", "go", "look", "examine", "open", "close", "kick",
+    "pick", "use", "put", "grab", "tie", "read", "talk", "give", "throw",
+    "push", "pull", "climb", "enter", "leave", "unlock", "lock", "eat",
+    "drink", "attack", "hit", "search", "move", "walk", "run", "ask", "tell",
+    "wear", "light", "break", "turn", "fill", "show", "listen", "touch",
+    "cut", "dig", "wait"}) | _CONVERSATIONAL_VERBS
+_RULE_SUBJECTS = frozenset({"i", "you", "we"})
+_RULE_DETERMINERS = frozenset({"the", "a", "an", "my", "your", "his", "her",
+                               "their", "our", "some"})
+_RULE_PREPOSITIONS = frozenset({
+    "to", "about", "with", "from", "on", "in", "at", "for", "into", "onto",
+    "around", "under", "over", "through", "behind", "inside", "across",
+    "toward", "towards", "near", "beside", "by"})
+# Verb particles: "pick up the key" keeps "key" as the direct object
+_RULE_PARTICLES = frozenset({"up", "down", "out", "off", "away", "back"})
+# Before a noun phrase a particle can also be a preposition ("go down the
+# stairs" has "stairs" as its pobj); only these verbs take it as a particle
+_RULE_PHRASAL_VERBS = frozenset({
+    ("pick", "up"), ("put", "down"), ("take", "off"), ("take", "out"),
+    ("turn", "off"), ("throw", "away")})
+# Prepositions that can also be a verb particle when they directly follow
+# the verb; those commands are left to spaCy
+_RULE_PARTICLE_OR_PREP = frozenset({
+    "on", "in", "over", "through", "around", "about", "across", "by",
+    "inside"})
+_RULE_CONJUNCTIONS = frozenset({"and", "then"})
+_RULE_CLOSED_CLASS = (_RULE_SUBJECTS | _RULE_DETERMINERS | _RULE_PREPOSITIONS
+                      | _RULE_PARTICLES | _RULE_CONJUNCTIONS | _PRONOUNS)
+_RULE_NP_BOUNDARY = _RULE_PREPOSITIONS | _RULE_CONJUNCTIONS
+_RULE_TEXT_RE = re.compile(r"^\s*[A-Za-z]+(?:\s+[A-Za-z]+)*\s*[.!]?\s*$")
+_WORD_RE = re.compile(r"[A-Za-z]+")
+# Capitalized word after the first one: likely a name, so NER is needed
+_PROPER_NOUN_RE = re.compile(r"\s[A-Z][a-z]+\b")
+
+
+def _intern_optional(word: Optional[str]) -> Optional[str]:
+    """sys.intern() that passes None through"""
+    return None if word is None else sys.intern(word)
+
+
+@dataclass(frozen=True, slots=True)
 class Entity:
     text: str
     label: str
     confidence: float
     start: int
     end: int
+    # Lower-cased text, computed once for case-insensitive lookups
+    text_lower: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "text_lower", self.text.lower())
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Dependency:
     token: str
     pos: str
@@ -35,16 +148,25 @@ class Dependency:
     head: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ParsedCommand:
     subject: Optional[str]
-    verbs: List[str]
+    verbs: Tuple[str, ...]
     direct_object: Optional[str]
     indirect_object: Optional[str]
-    prepositions: List[str]
-    entities: List[Entity]
-    dependencies: List[Dependency]
+    prepositions: Tuple[str, ...]
+    entities: Tuple[Entity, ...]
+    dependencies: Tuple[Dependency, ...]
     original_text: str
+    # Hashed views of verbs and prepositions for membership checks
+    verbs_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    prepositions_set: FrozenSet[str] = field(init=False, repr=False,
+                                             compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "verbs_set", frozenset(self.verbs))
+        object.__setattr__(self, "prepositions_set",
+                           frozenset(self.prepositions))
 
     def to_contract_format(self) -> Dict[str, Any]:
         """Convert to format suitable for blockchain contracts"""
@@ -54,22 +176,30 @@ class ParsedCommand:
             "target": self.direct_object,
             "modifier": self.indirect_object,
             "context": {
-                "prepositions": self.prepositions,
+                "prepositions": list(self.prepositions),
                 "entities": [{"text": e.text, "type": e.label}
                              for e in self.entities],
-                "confidence": (min([e.confidence for e in self.entities])
-                               if self.entities else 1.0)
+                "confidence": min((e.confidence for e in self.entities),
+                                  default=1.0)
             }
         }
 
 
 class LightweightNLPParser:
-    def __init__(self, use_spacy: bool = True, model_size: str = "small"):
+    def __init__(self, use_spacy: bool = True, model_size: str = "small",
+                 exclude: Iterable[str] = DEFAULT_SPACY_EXCLUDE,
+                 lazy_spacy: bool = True):
         self.use_spacy = use_spacy
         self.model_size = model_size
+        self.exclude = tuple(exclude)
+        # Parse plain commands with rules, running spaCy only when needed;
+        # False sends every command through the model
+        self.lazy_spacy = lazy_spacy
         self.nlp = None
         self.ner_pipeline = None
         self.models_loaded = False
+        self._cache: OrderedDict[Tuple[str, bool], ParsedCommand] = \
+            OrderedDict()
 
         print(f"Initializing lightweight parser "
               f"(use_spacy={use_spacy}, size={model_size})")
@@ -95,8 +225,16 @@ class LightweightNLPParser:
                 # Even smaller if available
                 model_name = "en_core_web_sm"  # Already the smallest
 
-            print(f"  Loading spaCy model: {model_name}")
-            self.nlp = spacy.load(model_name)
+            key = (model_name, self.exclude)
+            with _NLP_SINGLETON_LOCK:
+                nlp = _NLP_SINGLETON.get(key)
+                if nlp is None:
+                    print(f"  Loading spaCy model: {model_name}")
+                    nlp = spacy.load(model_name, exclude=list(self.exclude))
+                    _NLP_SINGLETON[key] = nlp
+                else:
+                    print(f"  Reusing loaded spaCy model: {model_name}")
+            self.nlp = nlp
 
         except OSError:
             print("spaCy model not found. Install with:")
@@ -107,29 +245,81 @@ class LightweightNLPParser:
     def _load_transformers_models(self) -> None:
         """Load small transformer models as fallback"""
         try:
+            # Imported here: transformers pulls in torch, which is slow to
+            # import and not needed at all on the spaCy path
+            from transformers import pipeline
+
             # Use DistilBERT - much smaller than BERT (~250MB vs 1.3GB)
             print("  Loading DistilBERT NER model...")
-            self.ner_pipeline = pipeline(
-                "ner",
-                model="distilbert-base-cased",  # ~250MB
-                tokenizer="distilbert-base-cased",
-                aggregation_strategy="simple",
-                device=-1  # Force CPU to avoid GPU memory issues
-            )
+            quantized = self._load_quantized_ner_model()
+            if quantized is not None:
+                try:
+                    self.ner_pipeline = self._ner_pipeline(pipeline, quantized)
+                except Exception as e:
+                    print(f"INT8 ONNX pipeline failed, using FP32 model: {e}")
+            if self.ner_pipeline is None:
+                self.ner_pipeline = self._ner_pipeline(pipeline,
+                                                       _NER_MODEL_NAME)
 
         except Exception as e:
             print(f"Failed to load transformer models: {e}")
             print("Using rule-based parsing only...")
 
-    def extract_entities_spacy(self, text: str) -> List[Entity]:
-        """Extract entities using spaCy"""
-        doc = self.nlp(text)
+    @staticmethod
+    def _ner_pipeline(pipeline, model):
+        """Token-classification pipeline over model, on CPU"""
+        return pipeline(
+            "ner",
+            model=model,  # ~250MB FP32, ~4x smaller as INT8 ONNX
+            tokenizer=_NER_MODEL_NAME,
+            aggregation_strategy="simple",
+            device=-1  # Force CPU to avoid GPU memory issues
+        )
+
+    @staticmethod
+    def _load_quantized_ner_model():
+        """DistilBERT exported to ONNX with dynamic INT8 weights
+
+        Needs optimum[onnxruntime]; returns None when it is missing or the
+        export fails, so the caller falls back to the FP32 model.
+        """
+        try:
+            from optimum.onnxruntime import (ORTModelForTokenClassification,
+                                             ORTQuantizer)
+            from optimum.onnxruntime.configuration import \
+                AutoQuantizationConfig
+        except ImportError:
+            return None
+
+        try:
+            quantized_path = os.path.join(_ONNX_CACHE_DIR,
+                                          _ONNX_QUANTIZED_FILE)
+            if not os.path.exists(quantized_path):
+                print("  Exporting DistilBERT to ONNX with INT8 weights...")
+                model = ORTModelForTokenClassification.from_pretrained(
+                    _NER_MODEL_NAME, export=True)
+                quantizer = ORTQuantizer.from_pretrained(model)
+                config = AutoQuantizationConfig.avx512_vnni(
+                    is_static=False, per_channel=False)
+                quantizer.quantize(save_dir=_ONNX_CACHE_DIR,
+                                   quantization_config=config)
+                model.config.save_pretrained(_ONNX_CACHE_DIR)
+
+            return ORTModelForTokenClassification.from_pretrained(
+                _ONNX_CACHE_DIR, file_name=_ONNX_QUANTIZED_FILE)
+
+        except Exception as e:
+            print(f"INT8 ONNX export failed, using FP32 model: {e}")
+            return None
+
+    def extract_entities_spacy(self, doc) -> List[Entity]:
+        """Extract entities from a spaCy doc"""
         entities = []
 
         for ent in doc.ents:
             entity = Entity(
                 text=ent.text,
-                label=ent.label_,
+                label=sys.intern(ent.label_),
                 confidence=1.0,  # spaCy doesn't provide confidence by default
                 start=ent.start_char,
                 end=ent.end_char
@@ -138,16 +328,15 @@ class LightweightNLPParser:
 
         return entities
 
-    def extract_dependencies_spacy(self, text: str) -> List[Dependency]:
-        """Extract dependencies using spaCy"""
-        doc = self.nlp(text)
+    def extract_dependencies_spacy(self, doc) -> List[Dependency]:
+        """Extract dependencies from a spaCy doc"""
         dependencies = []
 
         for token in doc:
             dep = Dependency(
                 token=token.text,
-                pos=token.pos_,
-                dependency=token.dep_,
+                pos=sys.intern(token.pos_),
+                dependency=sys.intern(token.dep_),
                 head=token.head.i if token.head != token else -1
             )
             dependencies.append(dep)
@@ -182,42 +371,60 @@ class LightweightNLPParser:
 
     def _extract_grammatical_components_spacy(self, doc) -> Dict[str, Any]:
         """Extract grammatical components from spaCy doc"""
-        subject = None
-        verbs = []
-        direct_objects = []
-        indirect_object = None
-        prepositions = []
+        # One C-level copy of the tags; token strings are only resolved
+        # for the few positions that end up in the result.
+        pos, dep = doc.to_array([POS, DEP]).T
+
+        # Each token lands in the first matching role, in this order
+        is_subject = dep == _DEP_NSUBJ
+        rest = ~is_subject
+        is_verb = rest & (pos == _POS_VERB)
+        rest &= ~is_verb
+        is_dobj = rest & (dep == _DEP_DOBJ)
+        rest &= ~is_dobj
+        is_pobj = rest & (dep == _DEP_POBJ)
+        rest &= ~is_pobj
+        # Adverbial particles count too, like "around" in "look around"
+        is_preposition = rest & ((pos == _POS_ADP) |
+                                 ((pos == _POS_ADV) & (dep == _DEP_ADVMOD)))
+        is_noun = rest & (pos == _POS_NOUN)
+
+        subject_idx = np.flatnonzero(is_subject)
+        subject = doc[int(subject_idx[-1])].text if subject_idx.size else None
+        verbs = [doc[i].text for i in np.flatnonzero(is_verb).tolist()]
+        prepositions = [doc[i].text
+                        for i in np.flatnonzero(is_preposition).tolist()]
+
+        # For commands like "talk to John about the quest",
+        # prioritize the first prepositional object
+        pobj_idx = np.flatnonzero(is_pobj)
+        indirect_object = doc[int(pobj_idx[0])].text if pobj_idx.size else None
 
         # Track nouns for pronoun resolution
-        nouns = []
-
-        for token in doc:
-            if token.dep_ == "nsubj":
-                subject = token.text
-            elif token.pos_ == "VERB":
-                verbs.append(token.text)
-            elif token.dep_ == "dobj":
-                if token.text.lower() in ["it", "this", "that", "them"]:
-                    # Try to resolve pronoun
-                    if nouns:
-                        direct_objects.append(nouns[-1])  # Most recent
-                    else:
-                        direct_objects.append(token.text)
-                else:
-                    direct_objects.append(token.text)
-            elif token.dep_ == "pobj":
-                # For commands like "talk to John about the quest",
-                # prioritize the first prepositional object
-                if indirect_object is None:
-                    indirect_object = token.text
-            elif token.pos_ == "ADP":
-                prepositions.append(token.text)
-            elif token.pos_ == "ADV" and token.dep_ == "advmod":
-                # Handle adverbial particles like "around" in "look around"
-                prepositions.append(token.text)
-            elif token.pos_ == "NOUN":
-                nouns.append(token.text)
+        noun_idx = np.flatnonzero(is_noun)
+        nouns = [doc[i].text for i in noun_idx.tolist()]
 
+        direct_objects = []
+        for i in np.flatnonzero(is_dobj).tolist():
+            text = doc[i].text
+            if text.lower() in _PRONOUNS:
+                # Try to resolve pronoun to the most recent preceding noun
+                preceding = int(np.searchsorted(noun_idx, i))
+                direct_objects.append(nouns[preceding - 1]
+                                      if preceding else text)
+            else:
+                direct_objects.append(text)
+
+        return self._resolve_components(subject, verbs, direct_objects,
+                                        indirect_object, prepositions, nouns)
+
+    @staticmethod
+    def _resolve_components(subject: Optional[str], verbs: List[str],
+                            direct_objects: List[str],
+                            indirect_object: Optional[str],
+                            prepositions: List[str],
+                            nouns: List[str]) -> Dict[str, Any]:
+        """Pick the primary object and drop conversational intent verbs"""
         # For compound commands, use the resolved object
         primary_object = direct_objects[0] if direct_objects else None
         if len(direct_objects) > 1:
@@ -228,10 +435,8 @@ class LightweightNLPParser:
                     break
 
         # Handle conversational wrappers - prioritize action over intent verbs
-        conversational_verbs = {"want", "need", "would", "like", "try",
-                                "going", "gonna"}
         action_verbs = [v for v in verbs
-                        if v.lower() not in conversational_verbs]
+                        if v.lower() not in _CONVERSATIONAL_VERBS]
 
         if action_verbs and len(verbs) > 1:
             # If we have both conversational and action verbs, prioritize
@@ -270,42 +475,297 @@ class LightweightNLPParser:
             'prepositions': prepositions
         }
 
-    def parse(self, text: str) -> ParsedCommand:
-        """Main parsing method"""
+    @staticmethod
+    def _build_command(components: Dict[str, Any],
+                       entities: Iterable[Entity],
+                       dependencies: Iterable[Dependency],
+                       text: str) -> ParsedCommand:
+        """Assemble a ParsedCommand from extracted parts"""
+        # Positional, in field order: skips keyword matching in __init__.
+        # Words are interned so comparisons against them are mostly identity
+        return ParsedCommand(
+            _intern_optional(components['subject']),
+            tuple(map(sys.intern, components['verbs'])),
+            _intern_optional(components['direct_object']),
+            _intern_optional(components['indirect_object']),
+            tuple(map(sys.intern, components['prepositions'])),
+            tuple(entities),
+            tuple(dependencies),
+            text
+        )
+
+    @staticmethod
+    def _empty_command(text: str) -> ParsedCommand:
+        """Result for blank input"""
+        return ParsedCommand(None, (), None, None, (), (), (), text)
+
+    def _parse_doc(self, doc, text: str,
+                   include_dependencies: bool = False) -> ParsedCommand:
+        """Build a ParsedCommand from an already-processed spaCy doc"""
+        entities = self.extract_entities_spacy(doc)
+        dependencies = (self.extract_dependencies_spacy(doc)
+                        if include_dependencies else ())
+        components = self._extract_grammatical_components_spacy(doc)
+        return self._build_command(components, entities, dependencies, text)
+
+    @staticmethod
+    def _match_simple_command(text: str) -> Optional[ParsedCommand]:
+        """Rule-based fast path for short VERB [the] NOUN / VERB ADV input"""
+        match = _SIMPLE_OBJECT_RE.match(text)
+        if match and match.group(2) not in _SIMPLE_OBJECT_STOPWORDS:
+            return ParsedCommand(None, (sys.intern(match.group(1)),),
+                                 sys.intern(match.group(2)),
+                                 None, (), (), (), text)
+
+        match = _SIMPLE_MOVE_RE.match(text)
+        if match:
+            # Same shape spaCy gives: the adverb lands in prepositions
+            return ParsedCommand(None, (sys.intern(match.group(1)),), None,
+                                 None, (sys.intern(match.group(2)),), (), (),
+                                 text)
+
+        return None
+
+    @staticmethod
+    def _regex_parse(text: str) -> Optional[ParsedCommand]:
+        """Rule-based parse of plain imperative commands, None when unsure
+
+        Accepts "[I] VERB [PARTICLE] [NP] (PREP NP)..." clauses joined by
+        "and"/"then", where every noun phrase is a single noun with an
+        optional determiner, or a pronoun.
+        """
+        if not _RULE_TEXT_RE.match(text) or _PROPER_NOUN_RE.search(text):
+            return None
+
+        tokens = _WORD_RE.findall(text)
+        words = [token.lower() for token in tokens]
+        count = len(words)
+
+        def noun_phrase(i):
+            """(head noun, next index) of a noun phrase at i, else None"""
+            word = words[i]
+            next_word = words[i + 1] if i + 1 < count else None
+            if word in _PRONOUNS and (word in ("it", "them")
+                                      or next_word is None
+                                      or next_word in _RULE_CLOSED_CLASS):
+                return tokens[i], i + 1
+            head = i + 1 if word in _RULE_DETERMINERS or word in _PRONOUNS else i
+            if head >= count or words[head] in _RULE_CLOSED_CLASS:
+                return None
+            if head == i and words[head] in _RULE_VERBS:
+                return None
+            # One-word noun phrases only ("the red key" goes to spaCy)
+            after = head + 1
+            if after < count and words[after] not in _RULE_NP_BOUNDARY:
+                return None
+            return tokens[head], after
+
+        subject = None
+        verbs = []
+        direct_objects = []
+        indirect_object = None
+        prepositions = []
+
+        i = 0
+        if words[0] in _RULE_SUBJECTS:
+            subject = tokens[0]
+            i = 1
+
+        # What the previous word allows next: a verb, the verb's
+        # complement, an object after a particle, a prepositional object,
+        # or the end of the clause
+        expect = "verb"
+        while i < count:
+            word = words[i]
+            next_word = words[i + 1] if i + 1 < count else None
+
+            if word in _RULE_CONJUNCTIONS and verbs:
+                expect = "verb"
+                i += 1
+            elif expect == "verb":
+                if word not in _RULE_VERBS:
+                    return None
+                verbs.append(tokens[i])
+                expect = "complement"
+                i += 1
+            elif word == "to" and next_word in _RULE_VERBS:
+                # Infinitive marker in "I want to look", not a preposition
+                expect = "verb"
+                i += 1
+            elif word in _RULE_PARTICLES and expect == "complement":
+                if (next_word is not None
+                        and next_word not in _RULE_NP_BOUNDARY
+                        and (verbs[-1].lower(), word)
+                        not in _RULE_PHRASAL_VERBS):
+                    # "climb up the ladder": particle or preposition is
+                    # the parser's call
+                    return None
+                prepositions.append(tokens[i])
+                expect = "object"
+                i += 1
+            elif word in _RULE_PREPOSITIONS:
+                if expect == "complement" and word in _RULE_PARTICLE_OR_PREP:
+                    # "turn on the light" (particle + object) or "sit on
+                    # the chair" (preposition): only the parser can tell
+                    return None
+                prepositions.append(tokens[i])
+                expect = "prep_object"
+                i += 1
+            elif word in _DIRECTIONS and expect == "complement":
+                prepositions.append(tokens[i])
+                expect = "clause_end"
+                i += 1
+            elif expect == "clause_end":
+                return None
+            else:
+                phrase = noun_phrase(i)
+                if phrase is None:
+                    return None
+                noun, i = phrase
+                if expect == "prep_object":
+                    # Keep the first prepositional object, as spaCy does
+                    if indirect_object is None:
+                        indirect_object = noun
+                else:
+                    direct_objects.append(noun)
+                expect = "clause_end"
+
+        if expect == "verb":
+            return None
+
+        # spaCy only counts nouns outside the subject/object roles as
+        # pronoun antecedents, and every noun this grammar accepts is an
+        # object, so there are none: pronouns stay as written and the
+        # first direct object is the target, exactly as on the spaCy path
+        components = LightweightNLPParser._resolve_components(
+            subject, verbs, direct_objects, indirect_object, prepositions,
+            [])
+        return LightweightNLPParser._build_command(components, (), (), text)
+
+    def _match_rules(self, text: str) -> Optional[ParsedCommand]:
+        """Try the rule-based paths before falling back to a model
+
+        Both paths are off when lazy_spacy is False, so every command
+        goes through the model.
+        """
+        if not self.lazy_spacy:
+            return None
+        return self._match_simple_command(text) or self._regex_parse(text)
+
+    def _parse_fallback(self, text: str) -> ParsedCommand:
+        """Parse without spaCy, using the transformers NER pipeline"""
+        entities = self.extract_entities_transformers(text)
+        dependencies = []  # Would need POS pipeline for this
+        components = self._extract_grammatical_components_fallback(
+            dependencies)
+
+        return self._build_command(components, entities, dependencies, text)
+
+    def _cached(self, key: Tuple[str, bool]) -> Optional[ParsedCommand]:
+        """Memoized parse result for key, marking it recently used"""
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+        return result
+
+    def _cache_result(self, key: Tuple[str, bool],
+                      result: ParsedCommand) -> None:
+        """Memoize a parse result, evicting the least recently used one"""
+        self._cache[key] = result
+        if len(self._cache) > _PARSE_CACHE_MAX:
+            self._cache.popitem(last=False)
+
+    def parse(self, text: str, use_cache: bool = True,
+              include_dependencies: bool = False) -> ParsedCommand:
+        """Main parsing method
+
+        Results are memoized by input text in an LRU cache; they are frozen,
+        so callers share them safely. Pass use_cache=False to force
+        a fresh parse, e.g. when timing the pipeline itself. The per-token
+        dependency list is only built when include_dependencies is set.
+        """
         if not text.strip():
-            return ParsedCommand(
-                subject=None, verbs=[], direct_object=None,
-                indirect_object=None, prepositions=[], entities=[],
-                dependencies=[], original_text=text
-            )
+            return self._empty_command(text)
 
         if not self.models_loaded:
             raise RuntimeError("Models not loaded. Call load_models() first.")
 
-        if self.use_spacy and self.nlp:
-            # Use spaCy - faster and more efficient
-            doc = self.nlp(text)
-            entities = self.extract_entities_spacy(text)
-            dependencies = self.extract_dependencies_spacy(text)
-            components = self._extract_grammatical_components_spacy(doc)
-
-        else:
-            # Use transformers fallback
-            entities = self.extract_entities_transformers(text)
-            dependencies = []  # Would need POS pipeline for this
-            components = self._extract_grammatical_components_fallback(
-                dependencies)
+        key = (text, include_dependencies)
+        if use_cache:
+            cached = self._cached(key)
+            if cached is not None:
+                return cached
+
+        use_spacy = bool(self.use_spacy and self.nlp)
+        # The rule-based fast paths have no dependency parse to offer, but
+        # without spaCy nothing else produces one either
+        result = (None if include_dependencies and use_spacy
+                  else self._match_rules(text))
+        if result is None:
+            if use_spacy:
+                # Use spaCy - run the pipeline once and share the doc
+                doc = self.nlp(text)
+                result = self._parse_doc(doc, text, include_dependencies)
+                # Results hold plain strings only; drop the Doc and its
+                # token arrays now rather than at function exit
+                del doc
+            else:
+                # Use transformers fallback
+                result = self._parse_fallback(text)
+
+        if use_cache:
+            self._cache_result(key, result)
+        return result
+
+    def parse_batch(self, texts: List[str], n_process: int = 1,
+                    use_cache: bool = True,
+                    include_dependencies: bool = False
+                    ) -> List[ParsedCommand]:
+        """Parse several commands, streaming them through spaCy's nlp.pipe
+
+        Batching amortizes spaCy's per-doc overhead; raise n_process to
+        spread large batches over worker processes.
+        """
+        if not self.models_loaded:
+            raise RuntimeError("Models not loaded. Call load_models() first.")
 
-        return ParsedCommand(
-            subject=components['subject'],
-            verbs=components['verbs'],
-            direct_object=components['direct_object'],
-            indirect_object=components['indirect_object'],
-            prepositions=components['prepositions'],
-            entities=entities,
-            dependencies=dependencies,
-            original_text=text
-        )
+        if not (self.use_spacy and self.nlp):
+            return [self.parse(text, use_cache, include_dependencies)
+                    for text in texts]
+
+        results: List[Optional[ParsedCommand]] = [None] * len(texts)
+        # Texts left for spaCy, each piped once, with every index it fills
+        pending: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            if not text.strip():
+                results[i] = self._empty_command(text)
+                continue
+            if text in pending:
+                pending[text].append(i)
+                continue
+            key = (text, include_dependencies)
+            if use_cache:
+                results[i] = self._cached(key)
+            if results[i] is None and not include_dependencies:
+                results[i] = self._match_rules(text)
+                if results[i] is not None and use_cache:
+                    self._cache_result(key, results[i])
+            if results[i] is None:
+                pending[text] = [i]
+
+        if pending:
+            docs = self.nlp.pipe(iter(pending),
+                                 batch_size=min(64, len(pending)),
+                                 n_process=n_process)
+            for (text, indices), doc in zip(pending.items(), docs):
+                result = self._parse_doc(doc, text, include_dependencies)
+                for i in indices:
+                    results[i] = result
+                if use_cache:
+                    self._cache_result((text, include_dependencies), result)
+            del doc, docs
+
+        return results
 
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about loaded models"""
@@ -319,12 +779,25 @@ class LightweightNLPParser:
             info["spacy_version"] = self.nlp.meta["version"]
             info["estimated_size"] = "~15MB"
         elif self.ner_pipeline:
-            info["transformer_model"] = "distilbert-base-cased"
+            info["transformer_model"] = _NER_MODEL_NAME
             info["estimated_size"] = "~250MB"
 
         return info
 
 
+def _public_dict(items: List[Tuple[str, Any]]) -> Dict[str, Any]:
+    """asdict() factory that leaves out derived lookup fields"""
+    return {key: value for key, value in items if key not in _DERIVED_FIELDS}
+
+
+def _print_json(obj: Any) -> None:
+    """Print obj as 2-space indented JSON, via orjson when available"""
+    if orjson is not None:
+        print(orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode())
+    else:
+        print(json.dumps(obj, indent=2))
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Lightweight NLP Parser for Text Adventure Commands")
@@ -357,7 +830,7 @@ def main():
     if args.model_info:
         print("\nModel Information:")
         info = nlp_parser.get_model_info()
-        print(json.dumps(info, indent=2))
+        _print_json(info)
         return
 
     def process_text(text: str) -> None:
@@ -366,12 +839,14 @@ def main():
             return
 
         try:
-            result = nlp_parser.parse(text)
+            # Only the full JSON dump shows the per-token dependencies
+            result = nlp_parser.parse(
+                text, include_dependencies=args.output == "json")
 
             if args.output == "json":
-                print(json.dumps(asdict(result), indent=2))
+                _print_json(asdict(result, dict_factory=_public_dict))
             elif args.output == "contract":
-                print(json.dumps(result.to_contract_format(), indent=2))
+                _print_json(result.to_contract_format())
             else:  # human
                 print(f"\nInput: '{result.original_text}'")
                 print(f"Subject: {result.subject or 'implicit (you)'}")
@@ -388,7 +863,7 @@ def main():
                               f"confidence: {entity.confidence:.3f}")
 
                 print(f"\nContract format:")
-                print(json.dumps(result.to_contract_format(), indent=2))
+                _print_json(result.to_contract_format())
 
         except Exception as e:
             print(f"Error processing '{text}': {e}")
@@ -9,11 +9,21 @@ import pstats
 import time
 import tracemalloc
 import psutil
-import os
 import sys
-from memory_profiler import memory_usage
 from parser import LightweightNLPParser
 
+class OutcomeCounter:
+    """pytest plugin that tallies test outcomes as they are reported"""
+    def __init__(self):
+        self.passed = 0
+        self.failed = 0
+        
+    def pytest_runtest_logreport(self, report):
+        if report.failed:
+            self.failed += 1
+        elif report.passed and report.when == 'call':
+            self.passed += 1
+
 class PerformanceProfiler:
     def __init__(self):
         self.parser = None
@@ -25,7 +35,10 @@ class PerformanceProfiler:
         start_time = time.time()
         start_memory = psutil.Process().memory_info().rss / 1024 / 1024  # MB
         
-        self.parser = LightweightNLPParser(use_spacy=True, model_size="small")
+        # Rule paths off: the benchmarks time the spaCy pipeline, not the
+        # regex fast paths most of these commands would otherwise take
+        self.parser = LightweightNLPParser(use_spacy=True, model_size="small",
+                                           lazy_spacy=False)
         self.parser.load_models()
         
         setup_time = time.time() - start_time
@@ -47,15 +60,15 @@ class PerformanceProfiler:
         print(f"\n🔍 Profiling: '{command}' {description}")
         
         # Warmup run
-        self.parser.parse(command)
+        self.parser.parse(command, use_cache=False)
         
-        # Measure memory usage during parsing
-        def parse_command():
-            return self.parser.parse(command)
-        
-        start_time = time.time()
-        mem_usage = memory_usage(parse_command, interval=0.01, timeout=10)
-        end_time = time.time()
+        # Measure peak Python allocation during parsing
+        tracemalloc.start()
+        self.parser.parse(command, use_cache=False)
+        mem_current, mem_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        mem_peak_mb = mem_peak / 1024 / 1024
+        mem_current_mb = mem_current / 1024 / 1024
         
         # Multiple runs for timing accuracy
         runs = 100
@@ -63,7 +76,7 @@ class PerformanceProfiler:
         
         for _ in range(runs):
             start = time.perf_counter()
-            result = self.parser.parse(command)
+            result = self.parser.parse(command, use_cache=False)
             end = time.perf_counter()
             total_time += (end - start)
         
@@ -73,8 +86,8 @@ class PerformanceProfiler:
             'command': command,
             'description': description,
             'avg_time_ms': avg_time * 1000,
-            'memory_peak_mb': max(mem_usage) if mem_usage else 0,
-            'memory_baseline_mb': min(mem_usage) if mem_usage else 0,
+            'memory_peak_mb': mem_peak_mb,
+            'memory_retained_mb': mem_current_mb,
             'result': {
                 'verbs': result.verbs,
                 'direct_object': result.direct_object,
@@ -85,7 +98,7 @@ class PerformanceProfiler:
         }
         
         print(f"⏱️  Average time: {avg_time * 1000:.2f}ms")
-        print(f"🧠 Memory peak: {max(mem_usage) if mem_usage else 0:.1f}MB")
+        print(f"🧠 Peak allocation: {mem_peak_mb:.3f}MB")
         print(f"📈 Result: {len(result.verbs)} verbs, "
               f"{1 if result.direct_object else 0} direct obj, "
               f"{len(result.prepositions)} prepositions")
@@ -96,44 +109,57 @@ class PerformanceProfiler:
         """Detailed CPU profiling with cProfile"""
         print("\n🔬 Running detailed CPU profiling...")
         
+        texts = [cmd for cmd, _ in commands]
+
         def run_parsing_batch():
-            for cmd, _ in commands:
-                self.parser.parse(cmd)
-        
-        # Run with cProfile
-        profiler = cProfile.Profile()
-        profiler.enable()
-        
-        # Run parsing multiple times
-        for _ in range(10):
-            run_parsing_batch()
+            self.parser.parse_batch(texts, use_cache=False)
+        
+        def run_parsing_sequential():
+            for text in texts:
+                self.parser.parse(text, use_cache=False)
+        
+        def profile_runs(run):
+            # Run with cProfile, parsing multiple times
+            profiler = cProfile.Profile()
+            profiler.enable()
+            for _ in range(10):
+                run()
+            profiler.disable()
             
-        profiler.disable()
+            stats = pstats.Stats(profiler)
+            stats.sort_stats('cumulative')
+            return stats
         
-        # Save profile stats
-        stats = pstats.Stats(profiler)
-        stats.sort_stats('cumulative')
+        # Batched through nlp.pipe, as a deployed server would run, and
+        # one call per command for comparison
+        batch_stats = profile_runs(run_parsing_batch)
+        sequential_stats = profile_runs(run_parsing_sequential)
         
         # Save to file
-        import io
-        import contextlib
-        
         with open('profile_stats.txt', 'w') as f:
             f.write("CPU PROFILING RESULTS\n")
             f.write("=" * 50 + "\n\n")
             
-            # Capture print_stats output
-            output = io.StringIO()
-            with contextlib.redirect_stdout(output):
+            for title, stats in (("Batched (parse_batch)", batch_stats),
+                                 ("Sequential (parse)", sequential_stats)):
+                f.write(f"## {title}\n\n")
+                
+                # Stats binds sys.stdout when created, so point it at
+                # the file rather than redirecting stdout
+                stats.stream = f
                 stats.print_stats(20)
-            f.write(output.getvalue())
+                f.write("\n")
             
         print("📄 Detailed CPU profile saved to 'profile_stats.txt'")
+        print(f"⏱️  Batched: {batch_stats.total_tt:.3f}s, "
+              f"sequential: {sequential_stats.total_tt:.3f}s")
         
         # Get basic stats summary
         return {
-            'total_calls': stats.total_calls,
-            'total_time': stats.total_tt,
+            'total_calls': batch_stats.total_calls,
+            'total_time': batch_stats.total_tt,
+            'sequential_total_calls': sequential_stats.total_calls,
+            'sequential_total_time': sequential_stats.total_tt,
             'profile_saved': True
         }
     
@@ -141,15 +167,23 @@ class PerformanceProfiler:
         """Profile the entire test suite"""
         print("\n🧪 Profiling test suite execution...")
         
-        import subprocess
+        import io
+        import contextlib
+        import pytest
+        
+        # Run in-process: no fresh interpreter re-importing spaCy, and the
+        # tests reuse the pipeline already loaded by setup_parser()
+        counter = OutcomeCounter()
+        output = io.StringIO()
         
         start_time = time.time()
         start_memory = psutil.Process().memory_info().rss / 1024 / 1024
         
         # Run tests with timing
-        result = subprocess.run([
-            'python', '-m', 'pytest', 'tests/test_parser_steps.py', '-v', '--tb=short'
-        ], capture_output=True, text=True, cwd=os.getcwd())
+        with contextlib.redirect_stdout(output):
+            return_code = pytest.main([
+                'tests/test_parser_steps.py', '-v', '--tb=short'
+            ], plugins=[counter])
         
         end_time = time.time()
         end_memory = psutil.Process().memory_info().rss / 1024 / 1024
@@ -157,17 +191,15 @@ class PerformanceProfiler:
         test_time = end_time - start_time
         memory_used = end_memory - start_memory
         
-        # Parse test results
-        output_lines = result.stdout.split('\n')
-        passed_tests = len([line for line in output_lines if 'PASSED' in line])
-        failed_tests = len([line for line in output_lines if 'FAILED' in line])
+        passed_tests = counter.passed
+        failed_tests = counter.failed
         
         self.results['test_suite'] = {
             'total_time': test_time,
             'memory_increase': memory_used,
             'tests_passed': passed_tests,
             'tests_failed': failed_tests,
-            'return_code': result.returncode
+            'return_code': int(return_code)
         }
         
         print(f"⏱️  Test suite completed in {test_time:.2f}s")
@@ -206,8 +238,8 @@ class PerformanceProfiler:
         # Command benchmarks
         if 'commands' in self.results:
             report.append("## Command Parsing Performance")
-            report.append("| Command | Time (ms) | Memory (MB) | Result |")
-            report.append("|---------|-----------|-------------|---------|")
+            report.append("| Command | Time (ms) | Peak alloc (MB) | Result |")
+            report.append("|---------|-----------|-----------------|---------|")
             
             for cmd_result in self.results['commands']:
                 cmd = cmd_result['command'][:30] + "..." if len(cmd_result['command']) > 30 else cmd_result['command']
@@ -215,7 +247,7 @@ class PerformanceProfiler:
                 memory = cmd_result['memory_peak_mb']
                 result_summary = f"{len(cmd_result['result']['verbs'])}v, {1 if cmd_result['result']['direct_object'] else 0}o"
                 
-                report.append(f"| {cmd} | {time_ms:.2f} | {memory:.1f} | {result_summary} |")
+                report.append(f"| {cmd} | {time_ms:.2f} | {memory:.3f} | {result_summary} |")
             report.append("")
         
         # Test suite performance
@@ -237,7 +269,7 @@ class PerformanceProfiler:
             report.append(f"- Average parsing time: {sum(times)/len(times):.2f}ms")
             report.append(f"- Fastest parsing: {min(times):.2f}ms")
             report.append(f"- Slowest parsing: {max(times):.2f}ms")
-            report.append(f"- Average memory usage: {sum(memories)/len(memories):.1f}MB")
+            report.append(f"- Average peak allocation: {sum(memories)/len(memories):.3f}MB")
             report.append("")
         
         report_text = "\n".join(report)
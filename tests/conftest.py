@@ -0,0 +1,184 @@
+"""
+Shared hooks and fixtures for the NLP Parser BDD tests
+"""
+
+import os
+import re
+import threading
+
+import pytest
+from pytest_bdd.feature import get_features
+
+from parser import LightweightNLPParser
+
+FEATURE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            os.pardir, "features", "parser.feature")
+
+# Step text that hands a command to the parser
+PARSE_STEP_RE = re.compile(r'^I parse the command "(?P<command>.*)"$')
+
+# The steps read POS, dependencies and PERSON entities, so keep tagger,
+# attribute_ruler, parser and ner
+SPACY_EXCLUDE = ["lemmatizer", "senter"]
+
+# Loaded once and shared by every scenario, see shared_parser()
+_SHARED_PARSER = None
+_SPACY_PARSER = None
+_LOAD_ERROR = None
+_LOADER = None
+
+
+def _load_shared_parser():
+    """Load the shared parser and run one throwaway doc through spaCy"""
+    global _SHARED_PARSER, _LOAD_ERROR
+    try:
+        # lazy_spacy answers the commands no step checks entities for with
+        # rules, and only e.g. "talk to John" reaches the pipeline.
+        # use_spacy=False would not be cheaper; it loads a transformers NER.
+        parser = LightweightNLPParser(use_spacy=True, model_size="small",
+                                      exclude=SPACY_EXCLUDE)
+        parser.load_models()
+        if parser.nlp is not None:
+            # Call the pipeline directly: parse() would take the rule-based
+            # fast path and leave spaCy's lazily initialized state cold
+            parser.nlp("go north")
+        _SHARED_PARSER = parser
+    except BaseException as exc:
+        _LOAD_ERROR = exc
+
+
+def start_loading_shared_parser():
+    """Start loading the shared parser in the background, once"""
+    global _LOADER
+    if _LOADER is None:
+        _LOADER = threading.Thread(target=_load_shared_parser,
+                                   name="shared-parser-loader", daemon=True)
+        _LOADER.start()
+
+
+def get_shared_parser():
+    """The parser shared by all scenarios, waiting for it to finish loading"""
+    start_loading_shared_parser()
+    _LOADER.join()
+    if _LOAD_ERROR is not None:
+        raise _LOAD_ERROR
+    return _SHARED_PARSER
+
+
+def get_spacy_parser():
+    """Parser with the rule paths off, or None when spaCy isn't installed
+
+    Reuses the pipeline get_shared_parser() loaded, so it costs no second
+    model load.
+    """
+    global _SPACY_PARSER
+    if _SPACY_PARSER is None and get_shared_parser().nlp is not None:
+        parser = LightweightNLPParser(use_spacy=True, model_size="small",
+                                      exclude=SPACY_EXCLUDE, lazy_spacy=False)
+        parser.load_models()
+        _SPACY_PARSER = parser
+    return _SPACY_PARSER
+
+
+def _commands_by_scenario():
+    """Map scenario names to the commands their steps parse"""
+    commands = {}
+    for feature in get_features([FEATURE_FILE]):
+        for scenario in feature.scenarios.values():
+            matches = (PARSE_STEP_RE.match(step.name) for step in scenario.steps)
+            commands[scenario.name] = [
+                match.group("command") for match in matches if match]
+    return commands
+
+
+def _scenario_name(item):
+    """Scenario name of a pytest-bdd test, from its "<feature>: <name>" doc"""
+    doc = getattr(getattr(item, "obj", None), "__doc__", None) or ""
+    return doc.rpartition(": ")[2]
+
+
+def pytest_sessionstart(session):
+    """Load models while pytest collects, instead of after it"""
+    # Under pytest-xdist the controller only hands out tests; each worker
+    # is a fresh interpreter that loads its own copy. --collect-only (IDE
+    # test discovery) runs nothing, so it needs no models either
+    if (session.config.pluginmanager.has_plugin("dsession")
+            or session.config.option.collectonly):
+        return
+    start_loading_shared_parser()
+
+
+def _feature_commands():
+    """Every distinct command the feature file parses, in order"""
+    return list(dict.fromkeys(
+        command
+        for commands in _commands_by_scenario().values()
+        for command in commands
+    ))
+
+
+def pytest_generate_tests(metafunc):
+    """Run tests taking `feature_command` once per feature-file command"""
+    if "feature_command" in metafunc.fixturenames:
+        commands = _feature_commands()
+        metafunc.parametrize("feature_command", commands, ids=commands)
+
+
+def _item_commands(item, by_scenario):
+    """Commands a collected test will parse, scenario or parametrized case"""
+    callspec = getattr(item, "callspec", None)
+    if callspec is not None:
+        for name in ("command", "feature_command"):
+            if name in callspec.params:
+                return [callspec.params[name]]
+    return by_scenario.get(_scenario_name(item), ())
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(session, config, items):
+    """Warm the shared parsers' caches with all collected test commands
+
+    One parse_batch call per parser runs them through nlp.pipe together;
+    the when step's parse() then returns the cached results.
+    """
+    if config.option.collectonly:
+        return
+
+    by_scenario = _commands_by_scenario()
+    texts = list(dict.fromkeys(
+        command
+        for item in items
+        for command in _item_commands(item, by_scenario)
+    ))
+    if not texts:
+        return
+
+    get_shared_parser().parse_batch(texts)
+    spacy_parser = get_spacy_parser()
+    if spacy_parser is not None:
+        spacy_parser.parse_batch(texts)
+
+
+@pytest.fixture(scope="session")
+def rule_parser():
+    """Loaded parser that answers plain commands with rules first"""
+    return get_shared_parser()
+
+
+@pytest.fixture(scope="session")
+def spacy_parser():
+    """Loaded parser that sends every command through spaCy"""
+    parser = get_spacy_parser()
+    if parser is None:
+        pytest.skip("spaCy model not installed; only the rule paths can run")
+    return parser
+
+
+@pytest.fixture(scope="session", params=["rule", "spacy"])
+def shared_parser(request):
+    """Loaded parser reused across scenarios, once per parsing mode
+
+    "spacy" turns the rule paths off, so the same scenarios also cover the
+    spaCy extraction and parse_batch's nlp.pipe branch.
+    """
+    return request.getfixturevalue(f"{request.param}_parser")
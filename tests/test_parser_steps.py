@@ -3,25 +3,48 @@
 BDD Step definitions for NLP Parser tests
 """
 
-from parser import LightweightNLPParser, ParsedCommand
-import sys
+import csv
+import logging
 import os
+import re
+
 import pytest
 from pytest_bdd import scenarios, given, when, then, parsers
 
-# Add parent directory to path to import parser module
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+log = logging.getLogger(__name__)
+
+# Command/expected-verb pairs checked by test_parse_matrix
+CASES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cases.csv")
+
+# Run every scenario once per shared_parser mode. pytest-bdd only asks for
+# parser_context while running steps, too late for fixture parametrization
+pytestmark = pytest.mark.usefixtures("shared_parser")
 
-# Load scenarios from the feature file
+# Load scenarios from the feature file. pytest-bdd keeps parsed features
+# in a per-process cache keyed by absolute path, which conftest.py's
+# get_features() call hits as well, so the file is parsed once per run
 scenarios('../features/parser.feature')
 
 
+# Step matchers, built once at import and shared by every step lookup
+PARSE_COMMAND = parsers.parse('I parse the command "{command}"')
+ACTION_SHOULD_BE = parsers.re(r'^the action should be "(?P<expected_action>[^"]+)"$')
+TARGET_SHOULD_BE = parsers.re(r'^the target should be "(?P<expected_target>[^"]+)"$')
+SUBJECT_SHOULD_BE = parsers.re(r'^the subject should be "(?P<expected_subject>[^"]+)"$')
+MODIFIER_SHOULD_BE = parsers.re(r'^the modifier should be "(?P<expected_modifier>[^"]+)"$')
+# One handler for '"a"', '"a" and "b"', '"a", "b" and "c"' ...
+PREPOSITIONS_CONTAIN = parsers.re(r'^the prepositions should contain (?P<preps>".+")$')
+QUOTED_RE = re.compile(r'"([^"]+)"')
+ENTITIES_CONTAIN_PERSON = parsers.parse(
+    'the entities should contain a person named "{name}"')
+
+
 @pytest.fixture
-def parser_context():
+def parser_context(shared_parser):
     """Context to store parser and results between steps"""
     return {
-        'parser': None,
+        'parser': shared_parser,
         'result': None,
         'command': None
     }
@@ -29,22 +52,20 @@ def parser_context():
 
 @given("I have a lightweight NLP parser")
 def given_parser(parser_context):
-    """Initialize the NLP parser"""
-    parser_context['parser'] = LightweightNLPParser(use_spacy=True,
-                                                    model_size="small")
-    parser_context['parser'].load_models()
+    """Use the session-wide NLP parser (loaded once, see conftest.py)"""
     assert parser_context['parser'].models_loaded
 
 
-@when(parsers.parse('I parse the command "{command}"'))
+@when(PARSE_COMMAND)
 def when_parse_command(parser_context, command):
     """Parse the given command"""
     parser_context['command'] = command
+    # Usually a cache hit: batch-parsed during collection (see conftest.py)
     parser_context['result'] = parser_context['parser'].parse(command)
     assert parser_context['result'] is not None
 
 
-@then(parsers.parse('the action should be "{expected_action}"'))
+@then(ACTION_SHOULD_BE)
 def then_action_should_be(parser_context, expected_action):
     """Check that the primary action matches expected"""
     result = parser_context['result']
@@ -53,7 +74,7 @@ def then_action_should_be(parser_context, expected_action):
         f"Expected action '{expected_action}', got '{actual_action}'"
 
 
-@then(parsers.parse('the target should be "{expected_target}"'))
+@then(TARGET_SHOULD_BE)
 def then_target_should_be(parser_context, expected_target):
     """Check that the target object matches expected"""
     result = parser_context['result']
@@ -61,7 +82,7 @@ def then_target_should_be(parser_context, expected_target):
         f"Expected target '{expected_target}', got '{result.direct_object}'"
 
 
-@then(parsers.parse('the subject should be "{expected_subject}"'))
+@then(SUBJECT_SHOULD_BE)
 def then_subject_should_be(parser_context, expected_subject):
     """Check that the subject matches expected"""
     result = parser_context['result']
@@ -71,7 +92,7 @@ def then_subject_should_be(parser_context, expected_subject):
         f"Expected subject '{expected_subject}', got '{actual_subject}'"
 
 
-@then(parsers.parse('the modifier should be "{expected_modifier}"'))
+@then(MODIFIER_SHOULD_BE)
 def then_modifier_should_be(parser_context, expected_modifier):
     """Check that the modifier (indirect object) matches expected"""
     result = parser_context['result']
@@ -79,59 +100,23 @@ def then_modifier_should_be(parser_context, expected_modifier):
         f"Expected modifier '{expected_modifier}', got '{result.indirect_object}'"
 
 
-@then(parsers.parse('the verbs should contain "{verb1}" and "{verb2}"'))
-def then_verbs_should_contain_two(parser_context, verb1, verb2):
-    """Check that verbs list contains both specified verbs"""
-    result = parser_context['result']
-    assert verb1 in result.verbs, f"Expected verb '{verb1}' not found in {result.verbs}"
-    assert verb2 in result.verbs, f"Expected verb '{verb2}' not found in {result.verbs}"
-
-
-@then(parsers.parse(
-    'the verbs should contain "{verb1}", "{verb2}" and "{verb3}"'))
-def then_verbs_should_contain_three(parser_context, verb1, verb2, verb3):
-    """Check that verbs list contains all three specified verbs"""
-    result = parser_context['result']
-    assert verb1 in result.verbs, f"Expected verb '{verb1}' not found in {result.verbs}"
-    assert verb2 in result.verbs, f"Expected verb '{verb2}' not found in {result.verbs}"
-    assert verb3 in result.verbs, f"Expected verb '{verb3}' not found in {result.verbs}"
-
-
-@then('the prepositions should contain "to" and "about"')
-def then_prepositions_should_contain_to_and_about(parser_context):
-    """Check that prepositions list contains both 'to' and 'about'"""
+@then(PREPOSITIONS_CONTAIN)
+def then_prepositions_should_contain(parser_context, preps):
+    """Check that prepositions list contains every quoted preposition"""
     result = parser_context['result']
-    assert "to" in result.prepositions, \
-        f"Expected preposition 'to' not found in {result.prepositions}"
-    assert "about" in result.prepositions, \
-        f"Expected preposition 'about' not found in {result.prepositions}"
+    missing = set(QUOTED_RE.findall(preps)) - result.prepositions_set
+    assert not missing, \
+        f"Expected prepositions {sorted(missing)} not found in {result.prepositions}"
 
 
-@then(parsers.parse('the prepositions should contain "{prep1}" and "{prep2}"'))
-def then_prepositions_should_contain_two(parser_context, prep1, prep2):
-    """Check that prepositions list contains both specified prepositions"""
-    result = parser_context['result']
-    assert prep1 in result.prepositions, \
-        f"Expected preposition '{prep1}' not found in {result.prepositions}"
-    assert prep2 in result.prepositions, \
-        f"Expected preposition '{prep2}' not found in {result.prepositions}"
-
-
-@then(parsers.parse('the prepositions should contain "{prep}"'))
-def then_prepositions_should_contain_one(parser_context, prep):
-    """Check that prepositions list contains the specified preposition"""
-    result = parser_context['result']
-    assert prep in result.prepositions, \
-        f"Expected preposition '{prep}' not found in {result.prepositions}"
-
-
-@then(parsers.parse('the entities should contain a person named "{name}"'))
+@then(ENTITIES_CONTAIN_PERSON)
 def then_entities_should_contain_person(parser_context, name):
     """Check that entities list contains a person with the specified name"""
     result = parser_context['result']
-    person_entities = [e for e in result.entities if e.label ==
-                       "PERSON" and name.lower() in e.text.lower()]
-    assert len(person_entities) > 0, \
+    needle = name.lower()
+    found = any(e.label == "PERSON" and needle in e.text_lower
+                for e in result.entities)
+    assert found, \
         f"Expected person entity '{name}' not found in {[e.text for e in result.entities]}"
 
 # Additional helper step definitions for debugging
@@ -139,15 +124,16 @@ def then_entities_should_contain_person(parser_context, name):
 
 @then("I should see the parsed result")
 def then_show_result(parser_context):
-    """Debug step to show the parsed result"""
+    """Debug step to log the parsed result (see it with --log-cli-level=DEBUG)"""
+    if not log.isEnabledFor(logging.DEBUG):
+        return
     result = parser_context['result']
-    print(f"\nParsed result for '{parser_context['command']}':")
-    print(f"  Subject: {result.subject}")
-    print(f"  Verbs: {result.verbs}")
-    print(f"  Direct Object: {result.direct_object}")
-    print(f"  Indirect Object: {result.indirect_object}")
-    print(f"  Prepositions: {result.prepositions}")
-    print(f"  Entities: {[(e.text, e.label) for e in result.entities]}")
+    log.debug("Parsed result for '%s': subject=%s verbs=%s direct_object=%s "
+              "indirect_object=%s prepositions=%s entities=%s",
+              parser_context['command'], result.subject, result.verbs,
+              result.direct_object, result.indirect_object,
+              result.prepositions,
+              [(e.text, e.label) for e in result.entities])
 
 
 @then("the parser should be loaded")
@@ -155,3 +141,19 @@ def then_parser_loaded(parser_context):
     """Check that the parser is properly loaded"""
     assert parser_context['parser'] is not None
     assert parser_context['parser'].models_loaded is True
+
+
+def _load_cases():
+    """(command, expected verbs) rows from cases.csv"""
+    with open(CASES_FILE, newline="") as f:
+        return [pytest.param(row["command"], row["verbs"].split(),
+                             id=row["command"])
+                for row in csv.DictReader(f)]
+
+
+@pytest.mark.parametrize("command,expected_verbs", _load_cases())
+def test_parse_matrix(shared_parser, command, expected_verbs):
+    """Check that the parsed verbs contain every expected verb"""
+    result = shared_parser.parse(command)
+    missing = [verb for verb in expected_verbs if verb not in result.verbs_set]
+    assert not missing, f"Expected verbs {missing} not found in {result.verbs}"
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Checks that the lazy rule paths agree with the spaCy pipeline
+"""
+
+from operator import attrgetter
+
+import pytest
+
+# The fields the rule paths fill in; entities and dependencies need spaCy
+GRAMMAR_FIELDS = attrgetter("subject", "verbs", "direct_object",
+                            "indirect_object", "prepositions")
+
+# Commands the grammar has got wrong before: pronouns as prepositional
+# objects or ahead of any noun, and words that are a particle or a
+# preposition depending on the verb
+EDGE_COMMANDS = [
+    "put the key in it",
+    "throw the rock at them",
+    "take the key and put the coin in it",
+    "take it and drop the ball",
+    "take the ball and kick it at the window",
+    "go down the stairs",
+    "climb up the ladder",
+    "walk out the door",
+    "put down the sword",
+    "go back to the castle",
+    "turn on the light",
+]
+
+
+def assert_rules_agree(rule_parser, spacy_parser, command):
+    """Assert both parsers give the same grammatical fields for a command"""
+    rule_result = rule_parser.parse(command)
+    spacy_result = spacy_parser.parse(command)
+    assert GRAMMAR_FIELDS(rule_result) == GRAMMAR_FIELDS(spacy_result), \
+        f"Rules gave {rule_result}, spaCy gave {spacy_result}"
+
+
+def test_rules_agree_with_spacy(rule_parser, spacy_parser, feature_command):
+    """Check that the rule paths parse a command the way spaCy does"""
+    assert_rules_agree(rule_parser, spacy_parser, feature_command)
+
+
+@pytest.mark.parametrize("command", EDGE_COMMANDS, ids=EDGE_COMMANDS)
+def test_rules_agree_on_edge_cases(rule_parser, spacy_parser, command):
+    """Check the commands the rules are most likely to misread"""
+    assert_rules_agree(rule_parser, spacy_parser, command)